@@ -19,6 +19,11 @@ from sqlalchemy import select, text
 from src.database import async_session, engine, init_db
 from src.models import Conversation, UserProfile
 
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s %(message)s",
@@ -228,4 +233,7 @@ async def ingest():
 
 
 if __name__ == "__main__":
-    asyncio.run(ingest())
+    if uvloop is not None:
+        uvloop.run(ingest())
+    else:
+        asyncio.run(ingest())
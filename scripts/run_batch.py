@@ -6,6 +6,11 @@ import logging
 
 from src.profile_engine.batch_processor import BatchProcessor
 
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
@@ -52,7 +57,10 @@ def main():
     )
 
     args = parser.parse_args()
-    asyncio.run(run(args))
+    if uvloop is not None:
+        uvloop.run(run(args))
+    else:
+        asyncio.run(run(args))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,22 @@
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from src.config import settings
 
-engine = create_async_engine(settings.database_url, echo=False, pool_size=20, max_overflow=10)
+
+def _json_serializer(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+engine = create_async_engine(
+    settings.database_url,
+    echo=False,
+    pool_size=20,
+    max_overflow=10,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+)
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
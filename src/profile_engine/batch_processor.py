@@ -5,17 +5,38 @@ import uuid
 from collections import defaultdict
 from pathlib import Path
 
-from sqlalchemy import select
+import orjson
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
-from src.database import async_session
+from src.database import async_session, engine
 from src.models import BehavioralSignal, Conversation, UserProfile
 from src.profile_engine.aggregator import ProfileAggregator
 from src.profile_engine.extractor import TraitExtractor
 
 logger = logging.getLogger(__name__)
 
+_CONVERSATION_COPY_COLUMNS = [
+    "conversation_id",
+    "user_id",
+    "model",
+    "language",
+    "total_turns",
+    "messages",
+    "processed",
+]
+
+
+def _to_uuid(value) -> uuid.UUID:
+    """Parse a dataset id as a UUID, deriving a stable uuid5 for non-UUID ids."""
+    try:
+        return uuid.UUID(value)
+    except (ValueError, TypeError):
+        return uuid.uuid5(uuid.NAMESPACE_DNS, str(value))
+
 
 class BatchProcessor:
     def __init__(self):
@@ -37,7 +58,13 @@ class BatchProcessor:
 
         # Group records by conversation
         conversations: dict[str, dict] = defaultdict(
-            lambda: {"messages": [], "user_id": None, "model": None, "language": None}
+            lambda: {
+                "messages": [],
+                "user_id": None,
+                "model": None,
+                "language": None,
+                "max_turn": 0,
+            }
         )
 
         logger.info("Reading dataset from %s", file_path)
@@ -59,12 +86,15 @@ class BatchProcessor:
                 conv["user_id"] = record.get("user_id")
                 conv["model"] = record.get("model")
                 conv["language"] = record.get("language")
+                turn = record.get("conversation_turn", 0)
+                if turn > conv["max_turn"]:
+                    conv["max_turn"] = turn
                 conv["messages"].append(
                     {
                         "role": record.get("role", ""),
                         "content": record.get("content", ""),
                         "message_index": record.get("message_index", 0),
-                        "conversation_turn": record.get("conversation_turn", 0),
+                        "conversation_turn": turn,
                         "redacted": record.get("redacted", False),
                     }
                 )
@@ -73,60 +103,48 @@ class BatchProcessor:
         logger.info("Read %d records into %d conversations", line_count, len(conversations))
         self._progress["total"] = len(conversations)
 
-        # Store conversations in batches
+        # Resolve each distinct user once and create all missing profiles in a
+        # single statement, concurrently with the conversation COPY batches.
+        user_uuids = {
+            user_id: _to_uuid(user_id)
+            for user_id in {c["user_id"] for c in conversations.values()}
+        }
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._ensure_user_profiles(set(user_uuids.values())))
+            tg.create_task(self._store_conversations(list(conversations.items()), user_uuids))
+
+        self._progress["status"] = "ingestion_complete"
+        return self._progress.copy()
+
+    async def _store_conversations(
+        self, conv_items: list[tuple[str, dict]], user_uuids: dict[str, uuid.UUID]
+    ) -> None:
+        """Write grouped conversations to the database in COPY batches."""
         batch_size = settings.batch_chunk_size
-        conv_items = list(conversations.items())
 
         for i in range(0, len(conv_items), batch_size):
             batch = conv_items[i : i + batch_size]
-            async with async_session() as db:
-                for conv_id_str, conv_data in batch:
-                    try:
-                        conv_uuid = uuid.UUID(conv_id_str)
-                    except ValueError:
-                        conv_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, conv_id_str)
-
-                    user_id_str = conv_data["user_id"]
-                    try:
-                        user_uuid = uuid.UUID(user_id_str)
-                    except (ValueError, TypeError):
-                        user_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, str(user_id_str))
-
-                    # Ensure user profile exists
-                    existing = await db.execute(
-                        select(UserProfile).where(UserProfile.user_id == user_uuid)
-                    )
-                    if existing.scalar_one_or_none() is None:
-                        db.add(UserProfile(user_id=user_uuid))
+            records = []
+            for conv_id_str, conv_data in batch:
+                # Sort messages by message_index
+                sorted_msgs = sorted(
+                    conv_data["messages"], key=lambda m: m.get("message_index", 0)
+                )
 
-                    # Sort messages by message_index
-                    sorted_msgs = sorted(
-                        conv_data["messages"], key=lambda m: m.get("message_index", 0)
+                records.append(
+                    (
+                        _to_uuid(conv_id_str),
+                        user_uuids[conv_data["user_id"]],
+                        conv_data["model"],
+                        conv_data["language"],
+                        conv_data["max_turn"],
+                        orjson.dumps(sorted_msgs).decode(),
+                        False,
                     )
+                )
 
-                    # Check if conversation already exists
-                    existing_conv = await db.execute(
-                        select(Conversation).where(
-                            Conversation.conversation_id == conv_uuid
-                        )
-                    )
-                    if existing_conv.scalar_one_or_none() is None:
-                        conv_record = Conversation(
-                            conversation_id=conv_uuid,
-                            user_id=user_uuid,
-                            model=conv_data["model"],
-                            language=conv_data["language"],
-                            total_turns=max(
-                                (m.get("conversation_turn", 0) for m in sorted_msgs), default=0
-                            ),
-                            messages=sorted_msgs,
-                            processed=False,
-                        )
-                        db.add(conv_record)
-
-                    self._progress["processed"] += 1
-
-                await db.commit()
+            await self._copy_conversations(records)
+            self._progress["processed"] += len(batch)
 
             logger.info(
                 "Ingested batch %d-%d of %d",
@@ -135,8 +153,49 @@ class BatchProcessor:
                 len(conv_items),
             )
 
-        self._progress["status"] = "ingestion_complete"
-        return self._progress.copy()
+    async def _ensure_user_profiles(self, user_uuids: set[uuid.UUID]) -> None:
+        """Create empty profiles for any users that don't have one yet."""
+        if not user_uuids:
+            return
+
+        user_ids = func.unnest(bindparam("user_ids", type_=ARRAY(UUID(as_uuid=True))))
+        stmt = (
+            pg_insert(UserProfile)
+            .from_select(["user_id"], select(user_ids))
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        async with async_session() as db:
+            await db.execute(stmt, {"user_ids": list(user_uuids)})
+            await db.commit()
+
+    async def _copy_conversations(self, records: list[tuple]) -> None:
+        """Bulk-load conversation rows with COPY, skipping ones that already exist.
+
+        COPY cannot resolve conflicts itself, so rows are staged in a temp table
+        and moved over with INSERT ... ON CONFLICT DO NOTHING.
+        """
+        if not records:
+            return
+
+        columns = ", ".join(_CONVERSATION_COPY_COLUMNS)
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            pg = raw.driver_connection
+            async with pg.transaction():
+                await pg.execute(
+                    "CREATE TEMP TABLE conversations_stage "
+                    "(LIKE conversations INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                await pg.copy_records_to_table(
+                    "conversations_stage",
+                    records=records,
+                    columns=_CONVERSATION_COPY_COLUMNS,
+                )
+                await pg.execute(
+                    f"INSERT INTO conversations ({columns}) "
+                    f"SELECT {columns} FROM conversations_stage "
+                    "ON CONFLICT (conversation_id) DO NOTHING"
+                )
 
     async def process_conversations(
         self, limit: int | None = None, user_id: uuid.UUID | None = None
@@ -144,37 +203,62 @@ class BatchProcessor:
         """Extract behavioral signals from unprocessed conversations."""
         self._progress["status"] = "extracting"
 
-        async with async_session() as db:
-            stmt = select(Conversation).where(Conversation.processed == False)  # noqa: E712
-            if user_id:
-                stmt = stmt.where(Conversation.user_id == user_id)
-            if limit:
-                stmt = stmt.limit(limit)
+        stmt = select(Conversation).where(Conversation.processed == False)  # noqa: E712
+        if user_id:
+            stmt = stmt.where(Conversation.user_id == user_id)
+        if limit:
+            stmt = stmt.limit(limit)
 
-            result = await db.execute(stmt)
-            convos = result.scalars().all()
+        async with async_session() as db:
+            total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
 
-        self._progress["total"] = len(convos)
+        self._progress["total"] = total or 0
         self._progress["processed"] = 0
 
-        semaphore = asyncio.Semaphore(settings.max_concurrent_extractions)
+        # Fixed pool of workers pulling from a bounded queue, so memory stays flat
+        # regardless of how many conversations are pending.
+        num_workers = max(1, settings.max_concurrent_extractions)
+        queue: asyncio.Queue[Conversation] = asyncio.Queue(maxsize=num_workers * 4)
 
         async def process_one(conv: Conversation):
-            async with semaphore:
+            try:
+                signals = await self.extractor.extract_signals(
+                    conv.messages, conv.conversation_id
+                )
+                await self._store_signals(conv, signals)
+                self._progress["processed"] += 1
+            except Exception:
+                logger.exception(
+                    "Failed to process conversation %s", conv.conversation_id
+                )
+                self._progress["failed"] += 1
+
+        async def worker():
+            while True:
+                conv = await queue.get()
                 try:
-                    signals = await self.extractor.extract_signals(
-                        conv.messages, conv.conversation_id
-                    )
-                    await self._store_signals(conv, signals)
-                    self._progress["processed"] += 1
-                except Exception:
-                    logger.exception(
-                        "Failed to process conversation %s", conv.conversation_id
-                    )
-                    self._progress["failed"] += 1
+                    await process_one(conv)
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(num_workers)]
+        try:
+            # Stream rows from a server-side cursor instead of loading them all.
+            # The session keeps its read transaction open until the last row is
+            # queued, i.e. for most of the run once the queue applies
+            # backpressure; workers write through their own sessions meanwhile.
+            async with async_session() as db:
+                result = await db.stream_scalars(
+                    stmt.execution_options(yield_per=settings.batch_chunk_size)
+                )
+                async for conv in result:
+                    await queue.put(conv)
 
-        tasks = [process_one(conv) for conv in convos]
-        await asyncio.gather(*tasks)
+            await queue.join()
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
         self._progress["status"] = "extraction_complete"
         return self._progress.copy()
@@ -205,13 +289,11 @@ class BatchProcessor:
                     db.add(signal)
 
             # Mark conversation as processed
-            stmt = select(Conversation).where(
-                Conversation.conversation_id == conv.conversation_id
+            await db.execute(
+                update(Conversation)
+                .where(Conversation.conversation_id == conv.conversation_id)
+                .values(processed=True)
             )
-            result = await db.execute(stmt)
-            conv_record = result.scalar_one_or_none()
-            if conv_record:
-                conv_record.processed = True
 
             await db.commit()
 
@@ -1,7 +1,8 @@
-import json
+import copy
 import logging
 import uuid
 
+import orjson
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from src.config import settings
@@ -11,10 +12,46 @@ from src.profile_engine.prompts import EXTRACTION_SYSTEM_PROMPT, EXTRACTION_USER
 logger = logging.getLogger(__name__)
 
 
+# (min, max, default) for every numeric field that gets clamped, per section
+_CLAMPED_FIELDS: dict[str, dict[str, tuple[float, float, float]]] = {
+    "temperament": {"score": (1, 10, 5)},
+    "communication_style": {
+        "formality": (0.0, 1.0, 0.5),
+        "verbosity": (0.0, 1.0, 0.5),
+        "technicality": (0.0, 1.0, 0.5),
+        "structured": (0.0, 1.0, 0.5),
+    },
+    "sentiment": {"overall": (-1.0, 1.0, 0.0)},
+    "life_stage": {"confidence": (0.0, 1.0, 0.5)},
+    "cooperation": {
+        "follows_instructions": (0.0, 1.0, 0.5),
+        "provides_context": (0.0, 1.0, 0.5),
+        "politeness": (0.0, 1.0, 0.5),
+    },
+}
+
+# Non-numeric fields copied through as-is, with their defaults
+_PASSTHROUGH_FIELDS: dict[str, dict] = {
+    "temperament": {"label": "neutral", "evidence": ""},
+    "sentiment": {"arc": "stable"},
+    "life_stage": {"indicators": [], "domain_expertise": []},
+}
+
+# "[ROLE]: " prefixes for the roles the dataset uses; any other role is
+# formatted inline so unexpected values can't grow a process-wide table.
+_ROLE_PREFIXES: dict[str, str] = {
+    role: f"[{role.upper()}]: " for role in ("user", "assistant", "system")
+}
+
+
 def _format_conversation(messages: list[dict]) -> str:
     lines = []
+    append = lines.append
     for msg in messages:
-        role = msg.get("role", "unknown").upper()
+        role = msg.get("role", "unknown")
+        prefix = _ROLE_PREFIXES.get(role)
+        if prefix is None:
+            prefix = f"[{role.upper()}]: "
         content = msg.get("content") or ""
         if isinstance(content, list):
             content = " ".join(
@@ -23,7 +60,7 @@ def _format_conversation(messages: list[dict]) -> str:
         # Truncate very long messages to keep prompt manageable
         if len(content) > 2000:
             content = content[:2000] + "... [truncated]"
-        lines.append(f"[{role}]: {content}")
+        append(prefix + content)
     return "\n\n".join(lines)
 
 
@@ -62,8 +99,8 @@ class TraitExtractor:
             raw_text = "\n".join(lines)
 
         try:
-            signals = json.loads(raw_text)
-        except json.JSONDecodeError:
+            signals = orjson.loads(raw_text)
+        except orjson.JSONDecodeError:
             logger.error(
                 "Failed to parse extraction response for conversation %s: %s",
                 conversation_id,
@@ -77,50 +114,21 @@ class TraitExtractor:
         """Ensure extracted signals have required structure."""
         validated = {}
 
-        # Temperament
-        temp = signals.get("temperament", {})
-        validated["temperament"] = {
-            "score": max(1, min(10, temp.get("score", 5))),
-            "label": temp.get("label", "neutral"),
-            "evidence": temp.get("evidence", ""),
-        }
-
-        # Communication style
-        style = signals.get("communication_style", {})
-        validated["communication_style"] = {
-            "formality": max(0.0, min(1.0, style.get("formality", 0.5))),
-            "verbosity": max(0.0, min(1.0, style.get("verbosity", 0.5))),
-            "technicality": max(0.0, min(1.0, style.get("technicality", 0.5))),
-            "structured": max(0.0, min(1.0, style.get("structured", 0.5))),
-        }
-
-        # Sentiment
-        sent = signals.get("sentiment", {})
-        validated["sentiment"] = {
-            "overall": max(-1.0, min(1.0, sent.get("overall", 0.0))),
-            "arc": sent.get("arc", "stable"),
-            "frustration_detected": bool(sent.get("frustration_detected", False)),
-        }
-
-        # Life stage
-        ls = signals.get("life_stage", {})
-        validated["life_stage"] = {
-            "indicators": ls.get("indicators", []),
-            "confidence": max(0.0, min(1.0, ls.get("confidence", 0.5))),
-            "domain_expertise": ls.get("domain_expertise", []),
-        }
-
-        # Topics
+        for section, fields in _CLAMPED_FIELDS.items():
+            src = signals.get(section, {})
+            out = {
+                key: max(lo, min(hi, src.get(key, default)))
+                for key, (lo, hi, default) in fields.items()
+            }
+            for key, default in _PASSTHROUGH_FIELDS.get(section, {}).items():
+                out[key] = src[key] if key in src else copy.copy(default)
+            validated[section] = out
+
+        validated["sentiment"]["frustration_detected"] = bool(
+            signals.get("sentiment", {}).get("frustration_detected", False)
+        )
         validated["topics"] = signals.get("topics", [])
 
-        # Cooperation
-        coop = signals.get("cooperation", {})
-        validated["cooperation"] = {
-            "follows_instructions": max(0.0, min(1.0, coop.get("follows_instructions", 0.5))),
-            "provides_context": max(0.0, min(1.0, coop.get("provides_context", 0.5))),
-            "politeness": max(0.0, min(1.0, coop.get("politeness", 0.5))),
-        }
-
         return validated
 
     def _empty_signals(self) -> dict:
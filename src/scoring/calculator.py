@@ -1,9 +1,14 @@
+import array
+import functools
 import logging
 import math
 import uuid
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
@@ -14,67 +19,169 @@ from src.scoring.reasoning import generate_reasoning
 logger = logging.getLogger(__name__)
 
 
+def _topic_diversity(value: dict) -> float:
+    topics = value.get("topics", [])
+    if isinstance(topics, list):
+        return min(100.0, len(set(topics)) * 20)
+    return 50.0
+
+
+def _domain_count(value: dict) -> float:
+    domains = value.get("domain_expertise", [])
+    if isinstance(domains, list):
+        return min(100.0, len(domains) * 25)
+    return 0.0
+
+
+# Numeric value extractors for the special computed fields of a signal payload
+_FIELD_EXTRACTORS: dict[str, Callable[[dict], float | None]] = {
+    # Invert and scale 1-10 to 0-100
+    "score_inverted": lambda value: (10 - value.get("score", 5)) / 10 * 100,
+    # Map [-1,1] inverted to [0,100]
+    "overall_inverted": lambda value: (1 - value.get("overall", 0.0)) / 2 * 100,
+    "frustration_detected": lambda value: (
+        100.0 if value.get("frustration_detected", False) else 0.0
+    ),
+    "diversity": _topic_diversity,
+    "domain_count": _domain_count,
+    # Scale 1-10 to 0-100
+    "score": lambda value: value.get("score", 5) / 10 * 100,
+    # Map [-1,1] to [0,100]
+    "overall": lambda value: (value.get("overall", 0.0) + 1) / 2 * 100,
+}
+
+
+def _field_extractor(field: str) -> Callable[[dict], float | None]:
+    """Extractor for one payload field; plain fields are read as direct numbers."""
+    if field in _FIELD_EXTRACTORS:
+        return _FIELD_EXTRACTORS[field]
+
+    def extract_direct(value: dict) -> float | None:
+        raw = value.get(field)
+        if isinstance(raw, (int, float)):
+            return raw * 100 if raw <= 1.0 else raw
+        return None
+
+    return extract_direct
+
+
+# Static per-dimension lookups, parsed once from DIMENSIONS:
+# signal type ids used, and (key, signal_type, field, weight) per weighted key.
+_SIGNAL_TYPE_IDS: dict[str, int] = {
+    sig_type: type_id
+    for type_id, sig_type in enumerate(
+        sorted({t for dim in DIMENSIONS.values() for t in dim.signal_types})
+    )
+}
+_UNSCORED_TYPE_ID = len(_SIGNAL_TYPE_IDS)  # signal types no dimension reads
+_DIM_SIGNAL_TYPES: dict[str, tuple[int, ...]] = {
+    name: tuple(_SIGNAL_TYPE_IDS[t] for t in dim.signal_types) for name, dim in DIMENSIONS.items()
+}
+_DIM_COMPONENTS: dict[str, tuple[tuple[str, str, str, float], ...]] = {
+    name: tuple((key, *key.split("."), weight) for key, weight in dim.signal_weights.items())
+    for name, dim in DIMENSIONS.items()
+}
+_DIM_KEY_WEIGHTS: dict[str, np.ndarray] = {
+    name: np.array(list(dim.signal_weights.values()), dtype=np.float64)
+    for name, dim in DIMENSIONS.items()
+}
+
+
+# (extractor, ((dimension, key id), ...)) for one payload field
+_FieldTargets = tuple[Callable[[dict], float | None], tuple[tuple[str, int], ...]]
+
+
+def _build_type_extractors() -> tuple[tuple[_FieldTargets, ...], ...]:
+    """Per signal type id: ((extractor, ((dimension, key id), ...)), ...).
+
+    Each payload field is extracted once per signal and fanned out to every
+    dimension key that reads it.
+    """
+    by_type: list[dict[str, list[tuple[str, int]]]] = [{} for _ in _SIGNAL_TYPE_IDS]
+    for name, components in _DIM_COMPONENTS.items():
+        for key_id, (_, sig_type, field, _) in enumerate(components):
+            by_type[_SIGNAL_TYPE_IDS[sig_type]].setdefault(field, []).append((name, key_id))
+    return tuple(
+        tuple((_field_extractor(field), tuple(targets)) for field, targets in fields.items())
+        for fields in by_type
+    )
+
+
+_TYPE_EXTRACTORS = _build_type_extractors()
+
+_DEFAULT_REASONING = {
+    name: f"Default score — no behavioral signals available for {name}" for name in DIMENSIONS
+}
+
+# Extracted components per (user, signal ids, signal timestamps). Component
+# values don't depend on time, so a user whose signals haven't changed skips
+# payload extraction on rescoring; recency is always recomputed. The cache is
+# module-level because the batch routes create a new ScoreCalculator per run.
+# Ids alone can be reused after a rollback, truncate or restore, so each
+# signal's extracted_at is part of the key.
+_COMPONENT_CACHE_SIZE = 1024
+_component_cache: OrderedDict[
+    tuple[uuid.UUID, bytes, bytes], dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]
+] = OrderedDict()
+
+
+def _score_kernel(
+    key_ids: np.ndarray, values: np.ndarray, base_weights: np.ndarray, key_weights: np.ndarray
+) -> tuple[float, float]:
+    """Return (weighted_sum, total_weight) for one dimension's components.
+
+    Each component's weight is its base weight times its key weight, as in the
+    numba kernel, so both produce the same sums; contributions are then summed
+    per key with ``np.bincount``.
+    """
+    size = key_weights.shape[0]
+    weights = base_weights * key_weights[key_ids]
+    weighted = np.bincount(key_ids, weights=values * weights, minlength=size)
+    totals = np.bincount(key_ids, weights=weights, minlength=size)
+    return float(weighted.sum()), float(totals.sum())
+
+
+@functools.cache
+def _kernel():
+    """The scoring kernel: numba-compiled when numba is installed, else NumPy.
+
+    numba is imported on first use rather than at module import, so code that
+    never scores signals doesn't pay for loading it.
+    """
+    try:
+        import numba
+    except ImportError:  # optional JIT
+        return _score_kernel
+
+    @numba.njit(cache=True, fastmath=True)
+    def jit_score_kernel(key_ids, values, base_weights, key_weights):
+        weighted_sum = 0.0
+        total_weight = 0.0
+        for i in range(values.shape[0]):
+            weight = base_weights[i] * key_weights[key_ids[i]]
+            weighted_sum += values[i] * weight
+            total_weight += weight
+        return weighted_sum, total_weight
+
+    return jit_score_kernel
+
+
 class ScoreCalculator:
     """Compute dynamic fit scores using recency-weighted behavioral signals."""
 
     def __init__(self, decay_lambda: float | None = None):
         self.decay_lambda = decay_lambda or settings.score_decay_lambda
+        # Scoring passes that extracted components ("initial") vs. reused them
+        # from the component cache ("cached").
+        self.statistics = {"initial": 0, "cached": 0}
 
     def recency_weight(self, days_since: float) -> float:
         """Exponential decay: exp(-λ * days)"""
         return math.exp(-self.decay_lambda * max(0.0, days_since))
 
-    def _extract_signal_value(self, signal: BehavioralSignal, key: str) -> float | None:
-        """Extract a numeric value from a signal given a dotted key."""
-        parts = key.split(".")
-        if len(parts) != 2:
-            return None
-
-        sig_type, field = parts
-
-        if signal.signal_type != sig_type:
-            return None
-
-        value = signal.signal_value
-
-        # Handle special computed fields
-        if field == "score_inverted":
-            raw = value.get("score", 5)
-            return (10 - raw) / 10 * 100  # Invert and scale to 0-100
-
-        if field == "overall_inverted":
-            raw = value.get("overall", 0.0)
-            return (1 - raw) / 2 * 100  # Map [-1,1] inverted to [0,100]
-
-        if field == "frustration_detected":
-            return 100.0 if value.get("frustration_detected", False) else 0.0
-
-        if field == "diversity":
-            topics = value.get("topics", [])
-            if isinstance(topics, list):
-                return min(100.0, len(set(topics)) * 20)
-            return 50.0
-
-        if field == "domain_count":
-            domains = value.get("domain_expertise", [])
-            if isinstance(domains, list):
-                return min(100.0, len(domains) * 25)
-            return 0.0
-
-        if field == "score":
-            raw = value.get("score", 5)
-            return raw / 10 * 100  # Scale 1-10 to 0-100
-
-        if field == "overall":
-            raw = value.get("overall", 0.0)
-            return (raw + 1) / 2 * 100  # Map [-1,1] to [0,100]
-
-        # Direct numeric field
-        raw = value.get(field)
-        if isinstance(raw, (int, float)):
-            return raw * 100 if raw <= 1.0 else raw
-
-        return None
+    def recency_weights(self, days_since: np.ndarray) -> np.ndarray:
+        """Vectorized ``recency_weight`` over an array of ages in days."""
+        return np.exp(-self.decay_lambda * np.maximum(days_since, 0.0))
 
     async def compute_score(
         self,
@@ -82,106 +189,283 @@ class ScoreCalculator:
         dimension_name: str,
         db: AsyncSession,
         now: datetime | None = None,
+        previous_scores: dict[str, float] | None = None,
     ) -> FitScore:
-        """Compute a single dimension score for a user."""
+        """Compute a single dimension score for a user.
+
+        ``previous_scores`` maps dimension → latest stored score; when omitted it
+        is fetched for this dimension.
+        """
         now = now or datetime.now(timezone.utc)
         dim_config = DIMENSIONS.get(dimension_name)
         if not dim_config:
             raise ValueError(f"Unknown dimension: {dimension_name}")
 
-        # Fetch relevant signals
-        stmt = (
-            select(BehavioralSignal)
-            .where(
-                BehavioralSignal.user_id == user_id,
-                BehavioralSignal.signal_type.in_(dim_config.signal_types),
-            )
-            .order_by(BehavioralSignal.extracted_at.desc())
+        signals = await self._fetch_signals(user_id, db, dim_config.signal_types)
+        if not signals:
+            fit_score = self._default_score(user_id, dimension_name, dim_config)
+            db.add(fit_score)
+            return fit_score
+
+        if previous_scores is None:
+            previous_scores = await self._fetch_previous_scores(user_id, db, dimension_name)
+        previous_score = previous_scores.get(dimension_name)
+
+        arrays = self._signal_arrays(signals, now)
+        fit_score = self._score_from_signals(
+            user_id,
+            dimension_name,
+            signals,
+            arrays,
+            self._components(user_id, signals, arrays)[dimension_name],
+            previous_score,
         )
-        result = await db.execute(stmt)
-        signals = result.scalars().all()
+        db.add(fit_score)
+        return fit_score
 
-        if not signals:
-            return self._default_score(user_id, dimension_name, dim_config, db)
+    def _signal_arrays(
+        self, signals: list[BehavioralSignal], now: datetime
+    ) -> dict[str, np.ndarray]:
+        """Column arrays over ``signals`` for the fields every dimension reads.
+
+        Built once per fetch so recency and base weights are computed in a single
+        vectorized pass rather than per dimension.
+        """
+        count = len(signals)
+        extracted = np.fromiter(
+            (s.extracted_at.replace(tzinfo=timezone.utc).timestamp() for s in signals),
+            dtype=np.float64,
+            count=count,
+        )
+        confidence = np.fromiter((s.confidence for s in signals), dtype=np.float64, count=count)
+        days_ago = (now.timestamp() - extracted) / 86400
+        recency = self.recency_weights(days_ago)
+        # Group rows by signal type: a stable sort keeps newest-first order
+        # within each type, and searchsorted finds where each type's run starts.
+        type_ids = np.fromiter(
+            (_SIGNAL_TYPE_IDS.get(s.signal_type, _UNSCORED_TYPE_ID) for s in signals),
+            dtype=np.intp,
+            count=count,
+        )
+        by_type = np.argsort(type_ids, kind="stable")
+        type_bounds = np.searchsorted(type_ids[by_type], np.arange(_UNSCORED_TYPE_ID + 1))
+        return {
+            "id": np.fromiter((s.id for s in signals), dtype=np.int64, count=count),
+            "extracted_at": extracted,
+            "by_type": by_type,
+            "type_bounds": type_bounds,
+            "days_ago": days_ago,
+            "base_weight": recency * confidence,
+        }
+
+    def _score_from_signals(
+        self,
+        user_id: uuid.UUID,
+        dimension_name: str,
+        signals: list[BehavioralSignal],
+        arrays: dict[str, np.ndarray],
+        components: tuple[np.ndarray, np.ndarray, np.ndarray],
+        previous_score: float | None,
+    ) -> FitScore:
+        """Score one dimension from already-fetched signals, without any I/O.
+
+        ``arrays`` and ``components`` come from ``_signal_arrays`` and
+        ``_components`` over the same ``signals``.
+        """
+        dim_config = DIMENSIONS[dimension_name]
+        bounds = arrays["type_bounds"]
+        if not any(bounds[t + 1] > bounds[t] for t in _DIM_SIGNAL_TYPES[dimension_name]):
+            return self._default_score(user_id, dimension_name, dim_config)
+
+        rows, key_ids, values = components
+        base_weights = arrays["base_weight"][rows]
+        key_weights = _DIM_KEY_WEIGHTS[dimension_name]
 
         # Compute weighted score
-        weighted_sum = 0.0
-        total_weight = 0.0
-        component_details = []
-
-        for signal in signals:
-            days_since = (now - signal.extracted_at.replace(tzinfo=timezone.utc)).total_seconds() / 86400
-            r_weight = self.recency_weight(days_since)
-
-            for key, key_weight in dim_config.signal_weights.items():
-                value = self._extract_signal_value(signal, key)
-                if value is not None:
-                    combined_weight = r_weight * signal.confidence * key_weight
-                    weighted_sum += value * combined_weight
-                    total_weight += combined_weight
-                    component_details.append(
-                        {
-                            "signal_id": signal.id,
-                            "key": key,
-                            "value": round(value, 2),
-                            "weight": round(combined_weight, 4),
-                            "days_ago": round(days_since, 1),
-                        }
-                    )
-
-        score = weighted_sum / total_weight if total_weight > 0 else dim_config.default_score
-        score = max(dim_config.min_score, min(dim_config.max_score, score))
-
-        # Get previous score
-        prev_stmt = (
-            select(FitScore)
-            .where(FitScore.user_id == user_id, FitScore.dimension == dimension_name)
-            .order_by(FitScore.scored_at.desc())
-            .limit(1)
-        )
-        prev_result = await db.execute(prev_stmt)
-        prev_score_record = prev_result.scalar_one_or_none()
-        previous_score = prev_score_record.score if prev_score_record else None
+        weighted_sum, total_weight = _kernel()(key_ids, values, base_weights, key_weights)
+
+        components = _DIM_COMPONENTS[dimension_name]
+        component_details = [
+            {
+                "signal_id": signals[row].id,
+                "key": components[key_id][0],
+                "value": round(value, 2),
+                "weight": round(weight, 4),
+                "days_ago": round(days_since, 1),
+            }
+            for row, key_id, value, weight, days_since in zip(
+                rows.tolist(),
+                key_ids.tolist(),
+                values.tolist(),
+                (base_weights * key_weights[key_ids]).tolist(),
+                arrays["days_ago"][rows].tolist(),
+            )
+        ]
+
+        if total_weight > 0:
+            score = weighted_sum / total_weight
+        else:
+            score = dim_config.default_score
+        # Reasoning describes the stored score, so its level label doesn't flip
+        # on floating-point noise at a bucket boundary (e.g. 19.999… vs 20).
+        score = round(max(dim_config.min_score, min(dim_config.max_score, score)), 1)
 
         reasoning_text = generate_reasoning(
             dimension_name, score, previous_score, component_details
         )
 
-        fit_score = FitScore(
+        return FitScore(
             user_id=user_id,
             dimension=dimension_name,
-            score=round(score, 1),
+            score=score,
             previous_score=previous_score,
             reasoning=reasoning_text,
             component_signals={"components": component_details[:20]},  # top 20 components
         )
-        db.add(fit_score)
 
-        return fit_score
+    def _components(
+        self,
+        user_id: uuid.UUID,
+        signals: list[BehavioralSignal],
+        arrays: dict[str, np.ndarray],
+    ) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(signal row, key id, value) for every component, per dimension.
+
+        A single pass over the signals, grouped by type, serves every
+        dimension. Results are cached on the user and their signal ids and
+        timestamps.
+        """
+        cache_key = (user_id, arrays["id"].tobytes(), arrays["extracted_at"].tobytes())
+        cached = _component_cache.get(cache_key)
+        if cached is not None:
+            _component_cache.move_to_end(cache_key)
+            self.statistics["cached"] += 1
+            return cached
+
+        # Typed buffers keep the collected components unboxed; NumPy views them
+        # without copying below.
+        collected = {
+            name: (array.array("q"), array.array("q"), array.array("d")) for name in DIMENSIONS
+        }
+        by_type, bounds = arrays["by_type"], arrays["type_bounds"]
+        for type_id, extractors in enumerate(_TYPE_EXTRACTORS):
+            for row in by_type[bounds[type_id] : bounds[type_id + 1]].tolist():
+                payload = signals[row].signal_value
+                for extract, targets in extractors:
+                    value = extract(payload)
+                    if value is None:
+                        continue
+                    for name, key_id in targets:
+                        rows, key_ids, values = collected[name]
+                        rows.append(row)
+                        key_ids.append(key_id)
+                        values.append(value)
+
+        result = {}
+        for name, (rows, key_ids, values) in collected.items():
+            rows = np.frombuffer(rows, dtype=np.int64)
+            key_ids = np.frombuffer(key_ids, dtype=np.int64)
+            # Back to fetch (newest-first) order, then the dimension's key order
+            order = np.lexsort((key_ids, rows))
+            result[name] = (
+                rows[order],
+                key_ids[order],
+                np.frombuffer(values, dtype=np.float64)[order],
+            )
+
+        _component_cache[cache_key] = result
+        if len(_component_cache) > _COMPONENT_CACHE_SIZE:
+            _component_cache.popitem(last=False)
+        self.statistics["initial"] += 1
+        return result
 
     async def compute_all_scores(
         self, user_id: uuid.UUID, db: AsyncSession
     ) -> dict[str, FitScore]:
-        """Compute all dimension scores for a user."""
-        scores = {}
-        for dimension_name in DIMENSIONS:
-            scores[dimension_name] = await self.compute_score(user_id, dimension_name, db)
+        """Compute all dimension scores for a user.
+
+        The user's signals and previous scores are each fetched once and shared
+        across every dimension.
+        """
+        now = datetime.now(timezone.utc)
+        signals = await self._fetch_signals(user_id, db)
+        if not signals:
+            scores = {
+                dimension_name: self._default_score(user_id, dimension_name, dim_config)
+                for dimension_name, dim_config in DIMENSIONS.items()
+            }
+            db.add_all(scores.values())
+            return scores
+
+        previous_scores = await self._fetch_previous_scores(user_id, db)
+        arrays = self._signal_arrays(signals, now)
+        components = self._components(user_id, signals, arrays)
+
+        scores = {
+            dimension_name: self._score_from_signals(
+                user_id,
+                dimension_name,
+                signals,
+                arrays,
+                components[dimension_name],
+                previous_scores.get(dimension_name),
+            )
+            for dimension_name in DIMENSIONS
+        }
+        db.add_all(scores.values())
         return scores
 
+    async def _fetch_signals(
+        self,
+        user_id: uuid.UUID,
+        db: AsyncSession,
+        signal_types: list[str] | None = None,
+    ) -> list[BehavioralSignal]:
+        """Fetch a user's signals, newest first, optionally limited to some types."""
+        stmt = select(BehavioralSignal).where(BehavioralSignal.user_id == user_id)
+        if signal_types is not None:
+            stmt = stmt.where(BehavioralSignal.signal_type.in_(signal_types))
+        result = await db.execute(stmt.order_by(BehavioralSignal.extracted_at.desc()))
+        return list(result.scalars().all())
+
+    async def _fetch_previous_scores(
+        self,
+        user_id: uuid.UUID,
+        db: AsyncSession,
+        dimension_name: str | None = None,
+    ) -> dict[str, float]:
+        """Fetch the latest stored score per dimension in a single query."""
+        conditions = [FitScore.user_id == user_id]
+        if dimension_name:
+            conditions.append(FitScore.dimension == dimension_name)
+
+        ranked = (
+            select(
+                FitScore.dimension,
+                FitScore.score,
+                func.row_number()
+                .over(partition_by=FitScore.dimension, order_by=FitScore.scored_at.desc())
+                .label("rank"),
+            )
+            .where(*conditions)
+            .subquery()
+        )
+        result = await db.execute(
+            select(ranked.c.dimension, ranked.c.score).where(ranked.c.rank == 1)
+        )
+        return {dimension: score for dimension, score in result.all()}
+
     def _default_score(
         self,
         user_id: uuid.UUID,
         dimension_name: str,
         dim_config: DimensionConfig,
-        db: AsyncSession,
     ) -> FitScore:
-        score = FitScore(
+        return FitScore(
             user_id=user_id,
             dimension=dimension_name,
             score=dim_config.default_score,
             previous_score=None,
-            reasoning=f"Default score — no behavioral signals available for {dimension_name}",
+            reasoning=_DEFAULT_REASONING[dimension_name],
             component_signals={"components": []},
         )
-        db.add(score)
-        return score
@@ -1,41 +1,56 @@
+import heapq
+
+_DIMENSION_LABELS = {
+    "responsiveness": "Responsiveness",
+    "escalation_risk": "Escalation risk",
+    "engagement_quality": "Engagement quality",
+    "cooperation_level": "Cooperation level",
+    "expertise_level": "Expertise level",
+}
+
+_NO_CHANGE = " No significant change from previous score."
+
+# Score-change sentence, keyed by direction
+_CHANGE_TEMPLATES = {
+    "up": " Score increased from {previous:.0f} → {score:.0f} (Δ{delta:+.0f}).",
+    "down": " Score decreased from {previous:.0f} → {score:.0f} (Δ{delta:+.0f}).",
+}
+
+
 def generate_reasoning(
     dimension: str,
     score: float,
     previous_score: float | None,
     components: list[dict],
 ) -> str:
-    """Generate a human-readable explanation of a score and its change."""
-    parts = []
+    """Generate a human-readable explanation of a score and its change.
 
-    # Score level description
-    level = _score_level(score)
-    parts.append(f"{_dimension_label(dimension)} is {level} at {score:.0f}/100.")
+    An unchanged score short-circuits before the contributing signals are
+    ranked: the steady state needs no explanation beyond the level.
+    """
+    summary = f"{_dimension_label(dimension)} is {_score_level(score)} at {score:.0f}/100."
 
     # Score change
+    change = ""
     if previous_score is not None:
         delta = score - previous_score
         if abs(delta) < 1.0:
-            parts.append("No significant change from previous score.")
-        else:
-            direction = "increased" if delta > 0 else "decreased"
-            parts.append(
-                f"Score {direction} from {previous_score:.0f} → {score:.0f} "
-                f"(Δ{delta:+.0f})."
-            )
+            return summary + _NO_CHANGE
+        change = _CHANGE_TEMPLATES["up" if delta > 0 else "down"].format(
+            previous=previous_score, score=score, delta=delta
+        )
 
     # Top contributing signals
+    key_signals = ""
     if components:
-        sorted_components = sorted(components, key=lambda c: c["weight"], reverse=True)
-        top = sorted_components[:3]
-        contributors = []
-        for comp in top:
-            key_label = comp["key"].replace(".", ": ").replace("_", " ")
-            contributors.append(
-                f"{key_label}={comp['value']:.0f} ({comp['days_ago']:.0f}d ago)"
-            )
-        parts.append("Key signals: " + "; ".join(contributors) + ".")
+        top = heapq.nlargest(3, components, key=lambda c: c["weight"])
+        key_signals = " Key signals: " + "; ".join(
+            f"{comp['key'].replace('.', ': ').replace('_', ' ')}="
+            f"{comp['value']:.0f} ({comp['days_ago']:.0f}d ago)"
+            for comp in top
+        ) + "."
 
-    return " ".join(parts)
+    return f"{summary}{change}{key_signals}"
 
 
 def _score_level(score: float) -> str:
@@ -51,11 +66,4 @@ def _score_level(score: float) -> str:
 
 
 def _dimension_label(dimension: str) -> str:
-    labels = {
-        "responsiveness": "Responsiveness",
-        "escalation_risk": "Escalation risk",
-        "engagement_quality": "Engagement quality",
-        "cooperation_level": "Cooperation level",
-        "expertise_level": "Expertise level",
-    }
-    return labels.get(dimension, dimension.replace("_", " ").title())
+    return _DIMENSION_LABELS.get(dimension) or dimension.replace("_", " ").title()
@@ -1,92 +1,119 @@
-import asyncio
-import json
 import os
 import uuid
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, MagicMock
 
 # Force a dummy provider config so imports don't fail during tests
 os.environ.setdefault("GAIL_LLM_PROVIDER", "anthropic")
 os.environ.setdefault("GAIL_ANTHROPIC_API_KEY", "test-key-not-used")
 
+import orjson
 import pytest
-import pytest_asyncio
-from sqlalchemy import JSON, String, event
-from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-
-from src.database import Base
-from src.models import BehavioralSignal, Conversation, FitScore, UserProfile
-
-# Use SQLite for tests — remap PostgreSQL types
+from sqlalchemy import event, insert
+from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+
+_CANNED_SIGNALS_JSON = '{"temperament":{"score":7,"label":"patient","evidence":"polite"},"communication_style":{"formality":0.6,"verbosity":0.4,"technicality":0.8,"structured":0.7},"sentiment":{"overall":0.3,"arc":"stable","frustration_detected":false},"life_stage":{"indicators":["professional"],"confidence":0.8,"domain_expertise":["finance"]},"topics":["finance","identity protection"],"cooperation":{"follows_instructions":0.8,"provides_context":0.7,"politeness":0.9}}'
+_CANNED_CHAT_REPLY = "Hello! How can I help you?"
+_SAMPLE_USER_ID = uuid.UUID("55798ace-d5ae-4797-a94f-3bc2f705d8c8")
+_SAMPLE_CONVERSATION_ID = uuid.UUID("aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee")
+
+# Use SQLite for tests — remap PostgreSQL types.
+# create_async_engine only accepts async drivers, so the synchronous pysqlite
+# driver can't be used here; aiosqlite's worker-thread hop is the cost of
+# exercising the same AsyncSession code paths as production.
+# Session-scoped fixtures are per worker under pytest-xdist (``pytest -n auto``),
+# so every worker gets its own in-memory database.
 TEST_DB_URL = "sqlite+aiosqlite:///:memory:"
 
+# Remap JSONB→JSON and UUID→VARCHAR(36) so create_all works with SQLite.
+# Registered as type-compiler visitors once at import, rather than wrapping
+# SQLiteTypeCompiler.process with isinstance checks.
+SQLiteTypeCompiler.visit_JSONB = SQLiteTypeCompiler.visit_JSON
+SQLiteTypeCompiler.visit_UUID = lambda self, type_, **kw: "VARCHAR(36)"
+
 
 @pytest.fixture(scope="session")
-def event_loop():
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def anyio_backend():
+    """Run async tests on asyncio, with uvloop when it is installed."""
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return "asyncio"
+    return "asyncio", {"use_uvloop": True}
 
 
-@pytest_asyncio.fixture
+@pytest.fixture(scope="session")
 async def db_engine():
-    # Remap PostgreSQL-specific types to SQLite-compatible types
-    # so create_all works with SQLite
-    _remap_pg_types()
+    # src.* is imported inside the fixtures so collecting DB-free tests stays
+    # cheap; importing src.models registers every table on Base.metadata.
+    from src.database import Base
+    import src.models  # noqa: F401
+
+    # One in-memory database for the whole session; tests are isolated by
+    # rolling back a per-test transaction in the ``db`` fixture.
+    # Same orjson codecs as the production engine.
+    engine = create_async_engine(
+        TEST_DB_URL,
+        echo=False,
+        poolclass=StaticPool,
+        json_serializer=lambda value: orjson.dumps(value).decode(),
+        json_deserializer=orjson.loads,
+    )
+
+    # pysqlite's implicit transaction handling breaks SAVEPOINTs, so let
+    # SQLAlchemy emit BEGIN itself.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
 
-    engine = create_async_engine(TEST_DB_URL, echo=False)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield engine
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
     await engine.dispose()
 
 
-def _remap_pg_types():
-    """Remap JSONB→JSON and UUID→String(36) for SQLite compatibility."""
-    from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
-
-    # Only patch once
-    if getattr(SQLiteTypeCompiler, "_gail_patched", False):
-        return
-    SQLiteTypeCompiler._gail_patched = True
-
-    original_process = SQLiteTypeCompiler.process
-
-    def patched_process(self, type_, **kw):
-        if isinstance(type_, JSONB):
-            return self.process(JSON(), **kw)
-        if isinstance(type_, UUID):
-            return "VARCHAR(36)"
-        return original_process(self, type_, **kw)
-
-    SQLiteTypeCompiler.process = patched_process
-
-
-@pytest_asyncio.fixture
+@pytest.fixture
 async def db(db_engine):
-    session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
-    async with session_factory() as session:
-        yield session
-        await session.rollback()
+    async with db_engine.connect() as conn:
+        outer = await conn.begin()
+        # Commits inside the test only release a SAVEPOINT; the outer
+        # rollback below leaves the tables empty for the next test.
+        # Seed fixtures flush explicitly, so autoflush would only add a
+        # dirty-set scan in front of every query.
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            autoflush=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await outer.rollback()
 
 
 @pytest.fixture
 def sample_user_id():
-    return uuid.UUID("55798ace-d5ae-4797-a94f-3bc2f705d8c8")
+    return _SAMPLE_USER_ID
 
 
 @pytest.fixture
 def sample_conversation_id():
-    return uuid.UUID("aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee")
+    return _SAMPLE_CONVERSATION_ID
 
 
-@pytest_asyncio.fixture
-async def sample_profile(db, sample_user_id):
-    profile = UserProfile(
-        user_id=sample_user_id,
+def _make_sample_profile(user_id):
+    from src.models import UserProfile
+
+    return UserProfile(
+        user_id=user_id,
         temperament={"score": 7, "label": "patient", "volatility": "low", "summary": "Calm user"},
         communication_style={
             "formality": 0.6,
@@ -102,67 +129,84 @@ async def sample_profile(db, sample_user_id):
         primary_language="English",
         current_arc="stable",
     )
+
+
+@pytest.fixture
+async def sample_profile(db, sample_user_id):
+    profile = _make_sample_profile(sample_user_id)
     db.add(profile)
     await db.flush()
     return profile
 
 
-@pytest_asyncio.fixture
-async def sample_signals(db, sample_user_id, sample_conversation_id):
-    signals = [
-        BehavioralSignal(
-            user_id=sample_user_id,
-            conversation_id=sample_conversation_id,
-            signal_type="temperament",
-            signal_value={"score": 7, "label": "patient", "evidence": "polite language"},
-            confidence=0.8,
-            extracted_at=datetime.now(timezone.utc),
-        ),
-        BehavioralSignal(
-            user_id=sample_user_id,
-            conversation_id=sample_conversation_id,
-            signal_type="communication_style",
-            signal_value={"formality": 0.7, "verbosity": 0.3, "technicality": 0.9, "structured": 0.6},
-            confidence=0.8,
-            extracted_at=datetime.now(timezone.utc),
-        ),
-        BehavioralSignal(
-            user_id=sample_user_id,
-            conversation_id=sample_conversation_id,
-            signal_type="sentiment",
-            signal_value={"overall": 0.4, "arc": "stable", "frustration_detected": False},
-            confidence=0.7,
-            extracted_at=datetime.now(timezone.utc),
-        ),
-        BehavioralSignal(
-            user_id=sample_user_id,
-            conversation_id=sample_conversation_id,
-            signal_type="cooperation",
-            signal_value={"follows_instructions": 0.8, "provides_context": 0.7, "politeness": 0.9},
-            confidence=0.8,
-            extracted_at=datetime.now(timezone.utc),
-        ),
-        BehavioralSignal(
-            user_id=sample_user_id,
-            conversation_id=sample_conversation_id,
-            signal_type="life_stage",
-            signal_value={"indicators": ["professional"], "confidence": 0.8, "domain_expertise": ["software"]},
-            confidence=0.8,
-            extracted_at=datetime.now(timezone.utc),
-        ),
-        BehavioralSignal(
-            user_id=sample_user_id,
-            conversation_id=sample_conversation_id,
-            signal_type="topics",
-            signal_value={"topics": ["technology", "software"]},
-            confidence=0.7,
-            extracted_at=datetime.now(timezone.utc),
-        ),
+@pytest.fixture(scope="session")
+def _signal_rows():
+    """Column values for the sample signals, built once per session."""
+    return [
+        {
+            "signal_type": "temperament",
+            "signal_value": {"score": 7, "label": "patient", "evidence": "polite language"},
+            "confidence": 0.8,
+        },
+        {
+            "signal_type": "communication_style",
+            "signal_value": {"formality": 0.7, "verbosity": 0.3, "technicality": 0.9, "structured": 0.6},
+            "confidence": 0.8,
+        },
+        {
+            "signal_type": "sentiment",
+            "signal_value": {"overall": 0.4, "arc": "stable", "frustration_detected": False},
+            "confidence": 0.7,
+        },
+        {
+            "signal_type": "cooperation",
+            "signal_value": {"follows_instructions": 0.8, "provides_context": 0.7, "politeness": 0.9},
+            "confidence": 0.8,
+        },
+        {
+            "signal_type": "life_stage",
+            "signal_value": {"indicators": ["professional"], "confidence": 0.8, "domain_expertise": ["software"]},
+            "confidence": 0.8,
+        },
+        {
+            "signal_type": "topics",
+            "signal_value": {"topics": ["technology", "software"]},
+            "confidence": 0.7,
+        },
+    ]
+
+
+async def _insert_sample_signals(db, user_id, conversation_id, signal_rows):
+    from src.models import BehavioralSignal
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            **row,
+            "user_id": user_id,
+            "conversation_id": conversation_id,
+            "extracted_at": now,
+        }
+        for row in signal_rows
     ]
-    for s in signals:
-        db.add(s)
+    # Single bulk INSERT ... RETURNING instead of per-object add + flush
+    result = await db.scalars(insert(BehavioralSignal).returning(BehavioralSignal), rows)
+    return result.all()
+
+
+@pytest.fixture
+async def sample_signals(db, sample_user_id, sample_conversation_id, _signal_rows):
+    return await _insert_sample_signals(db, sample_user_id, sample_conversation_id, _signal_rows)
+
+
+@pytest.fixture
+async def seeded_user(db, sample_user_id, sample_conversation_id, _signal_rows):
+    """The sample profile and its signals, seeded together in one fixture."""
+    profile = _make_sample_profile(sample_user_id)
+    db.add(profile)
     await db.flush()
-    return signals
+    signals = await _insert_sample_signals(db, sample_user_id, sample_conversation_id, _signal_rows)
+    return {"profile": profile, "signals": signals}
 
 
 @pytest.fixture
@@ -175,12 +219,21 @@ def sample_messages():
     ]
 
 
+class _FastLLM:
+    """Stand-in LLM client returning canned text, without Mock call bookkeeping."""
+
+    def __init__(self):
+        self.generate_reply = _CANNED_SIGNALS_JSON
+        self.chat_reply = _CANNED_CHAT_REPLY
+
+    async def generate(self, *args, **kwargs):
+        return self.generate_reply
+
+    async def chat(self, *args, **kwargs):
+        return self.chat_reply
+
+
 @pytest.fixture
 def mock_anthropic():
-    """Create a mock LLM client for tests."""
-    mock_client = AsyncMock()
-    mock_client.generate = AsyncMock(
-        return_value='{"temperament":{"score":7,"label":"patient","evidence":"polite"},"communication_style":{"formality":0.6,"verbosity":0.4,"technicality":0.8,"structured":0.7},"sentiment":{"overall":0.3,"arc":"stable","frustration_detected":false},"life_stage":{"indicators":["professional"],"confidence":0.8,"domain_expertise":["finance"]},"topics":["finance","identity protection"],"cooperation":{"follows_instructions":0.8,"provides_context":0.7,"politeness":0.9}}'
-    )
-    mock_client.chat = AsyncMock(return_value="Hello! How can I help you?")
-    return mock_client
+    """Fake LLM client for tests; set ``generate_reply`` to change the response."""
+    return _FastLLM()
@@ -1,43 +1,52 @@
 import uuid
+from collections import namedtuple
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from src.agent.adaptation_rules import generate_adaptation_rules, get_adaptation_summary
 from src.agent.prompt_builder import build_default_prompt, build_system_prompt
-from src.models import UserProfile
+
+_FakeProfile = namedtuple(
+    "_FakeProfile",
+    "communication_style temperament sentiment_trend primary_language current_arc",
+    defaults=(None, None, None),
+)
 
 
 class TestAdaptationRules:
     def test_formal_user(self):
-        profile = MagicMock(spec=UserProfile)
-        profile.communication_style = {"formality": 0.9, "verbosity": 0.5, "technicality": 0.5}
-        profile.temperament = {"score": 5, "label": "neutral"}
-        profile.sentiment_trend = {"direction": "stable"}
-        profile.primary_language = "English"
-        profile.current_arc = "stable"
+        profile = _FakeProfile(
+            communication_style={"formality": 0.9, "verbosity": 0.5, "technicality": 0.5},
+            temperament={"score": 5, "label": "neutral"},
+            sentiment_trend={"direction": "stable"},
+            primary_language="English",
+            current_arc="stable",
+        )
 
         rules = generate_adaptation_rules(profile, {})
         assert "formal" in rules.lower() or "professional" in rules.lower()
 
     def test_casual_terse_user(self):
-        profile = MagicMock(spec=UserProfile)
-        profile.communication_style = {"formality": 0.1, "verbosity": 0.1, "technicality": 0.2}
-        profile.temperament = {"score": 5, "label": "neutral"}
-        profile.sentiment_trend = {"direction": "stable"}
-        profile.primary_language = "English"
-        profile.current_arc = None
+        profile = _FakeProfile(
+            communication_style={"formality": 0.1, "verbosity": 0.1, "technicality": 0.2},
+            temperament={"score": 5, "label": "neutral"},
+            sentiment_trend={"direction": "stable"},
+            primary_language="English",
+            current_arc=None,
+        )
 
         rules = generate_adaptation_rules(profile, {})
         assert "casual" in rules.lower() or "concise" in rules.lower()
 
     def test_high_escalation_risk(self):
-        profile = MagicMock(spec=UserProfile)
-        profile.communication_style = {"formality": 0.5, "verbosity": 0.5, "technicality": 0.5}
-        profile.temperament = {"score": 2, "label": "impatient"}
-        profile.sentiment_trend = {"direction": "declining"}
-        profile.primary_language = "English"
-        profile.current_arc = None
+        profile = _FakeProfile(
+            communication_style={"formality": 0.5, "verbosity": 0.5, "technicality": 0.5},
+            temperament={"score": 2, "label": "impatient"},
+            sentiment_trend={"direction": "declining"},
+            primary_language="English",
+            current_arc=None,
+        )
 
         mock_score = MagicMock()
         mock_score.score = 85.0
@@ -47,20 +56,22 @@ class TestAdaptationRules:
         assert "escalation" in rules.lower() or "solution" in rules.lower()
 
     def test_non_english_user(self):
-        profile = MagicMock(spec=UserProfile)
-        profile.communication_style = {"formality": 0.5, "verbosity": 0.5, "technicality": 0.5}
-        profile.temperament = {"score": 5, "label": "neutral"}
-        profile.sentiment_trend = {"direction": "stable"}
-        profile.primary_language = "Spanish"
-        profile.current_arc = None
+        profile = _FakeProfile(
+            communication_style={"formality": 0.5, "verbosity": 0.5, "technicality": 0.5},
+            temperament={"score": 5, "label": "neutral"},
+            sentiment_trend={"direction": "stable"},
+            primary_language="Spanish",
+            current_arc=None,
+        )
 
         rules = generate_adaptation_rules(profile, {})
         assert "Spanish" in rules
 
     def test_get_adaptation_summary(self):
-        profile = MagicMock(spec=UserProfile)
-        profile.communication_style = {"formality": 0.1, "verbosity": 0.2, "technicality": 0.5}
-        profile.temperament = {"score": 8, "label": "patient"}
+        profile = _FakeProfile(
+            communication_style={"formality": 0.1, "verbosity": 0.2, "technicality": 0.5},
+            temperament={"score": 8, "label": "patient"},
+        )
 
         mock_score = MagicMock()
         mock_score.score = 25.0
@@ -71,6 +82,9 @@ class TestAdaptationRules:
         assert len(summary) > 0
 
 
+# Sync tests that take the async ``sample_profile`` fixture still need the
+# anyio backend so the plugin drives that fixture.
+@pytest.mark.usefixtures("anyio_backend")
 class TestPromptBuilder:
     def test_build_system_prompt(self, sample_profile):
         scores = {}
@@ -8,7 +8,7 @@ from src.profile_engine.aggregator import ProfileAggregator
 
 
 class TestProfileAggregator:
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_aggregate_creates_profile(self, db, sample_user_id, sample_signals):
         aggregator = ProfileAggregator()
         profile = await aggregator.aggregate(sample_user_id, db)
@@ -18,7 +18,7 @@ class TestProfileAggregator:
         assert profile.temperament is not None
         assert profile.temperament["label"] == "patient"
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_aggregate_communication_style(self, db, sample_user_id, sample_signals):
         aggregator = ProfileAggregator()
         profile = await aggregator.aggregate(sample_user_id, db)
@@ -28,7 +28,7 @@ class TestProfileAggregator:
         assert 0.0 <= style["formality"] <= 1.0
         assert "summary" in style
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_aggregate_sentiment(self, db, sample_user_id, sample_signals):
         aggregator = ProfileAggregator()
         profile = await aggregator.aggregate(sample_user_id, db)
@@ -37,7 +37,7 @@ class TestProfileAggregator:
         assert sentiment is not None
         assert sentiment["direction"] in ("stable", "improving", "declining", "volatile")
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_aggregate_no_signals(self, db):
         user_id = uuid.uuid4()
         # Create empty profile
@@ -50,7 +50,7 @@ class TestProfileAggregator:
 
         assert result.user_id == user_id
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_aggregate_updates_version(self, db, sample_user_id, sample_signals):
         # First create profile
         profile = UserProfile(user_id=sample_user_id, profile_version=1)
@@ -62,7 +62,7 @@ class TestProfileAggregator:
 
         assert updated.profile_version >= 2
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_topic_aggregation(self, db, sample_user_id, sample_signals):
         aggregator = ProfileAggregator()
         profile = await aggregator.aggregate(sample_user_id, db)
@@ -71,7 +71,7 @@ class TestProfileAggregator:
         assert topics is not None
         assert "primary" in topics
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_weighted_mean(self):
         aggregator = ProfileAggregator()
 
@@ -0,0 +1,136 @@
+import asyncio
+import uuid
+
+import orjson
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.config import settings
+from src.database import Base
+from src.models import BehavioralSignal, Conversation
+from src.profile_engine import batch_processor
+from src.profile_engine.batch_processor import BatchProcessor
+
+_USER_ID = uuid.uuid4()
+
+
+class _FakeExtractor:
+    """Returns canned signals, failing for selected conversations."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.tasks = set()
+
+    async def extract_signals(self, messages, conversation_id):
+        self.tasks.add(asyncio.current_task())
+        await asyncio.sleep(0)
+        if conversation_id in self.failing:
+            raise RuntimeError("extraction failed")
+        return {"temperament": {"score": 6, "label": "neutral"}, "topics": ["finance"]}
+
+
+@pytest.fixture
+async def session_factory(tmp_path, monkeypatch):
+    # The pool reads on one connection while workers write on others, so this
+    # needs a file database in WAL mode rather than the shared in-memory one.
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'batch.db'}",
+        json_serializer=lambda value: orjson.dumps(value).decode(),
+        json_deserializer=orjson.loads,
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_wal(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(batch_processor, "async_session", factory)
+    # Fewer workers than conversations and a small fetch size, so the stream
+    # blocks on the bounded queue and spans several fetches.
+    monkeypatch.setattr(settings, "max_concurrent_extractions", 2)
+    monkeypatch.setattr(settings, "batch_chunk_size", 3)
+    yield factory
+    await engine.dispose()
+
+
+async def _seed_conversations(factory, count: int) -> list[uuid.UUID]:
+    conversation_ids = [uuid.uuid4() for _ in range(count)]
+    async with factory() as db:
+        db.add_all(
+            Conversation(
+                conversation_id=conversation_id,
+                user_id=_USER_ID,
+                messages=[{"role": "user", "content": f"message {i}"}],
+            )
+            for i, conversation_id in enumerate(conversation_ids)
+        )
+        await db.commit()
+    return conversation_ids
+
+
+async def _unprocessed_ids(factory) -> set[uuid.UUID]:
+    async with factory() as db:
+        result = await db.scalars(
+            select(Conversation.conversation_id).where(Conversation.processed == False)  # noqa: E712
+        )
+        return set(result.all())
+
+
+def _processor(extractor: _FakeExtractor) -> BatchProcessor:
+    processor = BatchProcessor()
+    processor.extractor = extractor
+    return processor
+
+
+class TestProcessConversations:
+    @pytest.mark.anyio
+    async def test_processes_all_conversations(self, session_factory):
+        await _seed_conversations(session_factory, 20)
+
+        progress = await _processor(_FakeExtractor()).process_conversations()
+
+        assert progress == {
+            "total": 20,
+            "processed": 20,
+            "failed": 0,
+            "status": "extraction_complete",
+        }
+        assert await _unprocessed_ids(session_factory) == set()
+        async with session_factory() as db:
+            assert await db.scalar(select(func.count()).select_from(BehavioralSignal)) == 40
+
+    @pytest.mark.anyio
+    async def test_counts_failed_extractions(self, session_factory):
+        conversation_ids = await _seed_conversations(session_factory, 20)
+        failing = set(conversation_ids[::4])
+
+        progress = await _processor(_FakeExtractor(failing)).process_conversations()
+
+        assert progress["processed"] == 15
+        assert progress["failed"] == 5
+        assert progress["status"] == "extraction_complete"
+        assert await _unprocessed_ids(session_factory) == failing
+
+    @pytest.mark.anyio
+    async def test_limit(self, session_factory):
+        await _seed_conversations(session_factory, 20)
+
+        progress = await _processor(_FakeExtractor()).process_conversations(limit=7)
+
+        assert progress["total"] == 7
+        assert progress["processed"] == 7
+        assert len(await _unprocessed_ids(session_factory)) == 13
+
+    @pytest.mark.anyio
+    async def test_workers_cancelled(self, session_factory):
+        await _seed_conversations(session_factory, 20)
+        extractor = _FakeExtractor()
+
+        await _processor(extractor).process_conversations()
+
+        assert 0 < len(extractor.tasks) <= settings.max_concurrent_extractions
+        assert all(task.cancelled() for task in extractor.tasks)
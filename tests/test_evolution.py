@@ -1,4 +1,5 @@
 import uuid
+from collections import namedtuple
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock
 
@@ -8,33 +9,26 @@ from src.evolution.arc_detector import ArcDetector
 from src.evolution.conflict_resolver import ResolvedTrait, resolve_conflict, signals_in_window
 from src.evolution.snapshot import SnapshotManager
 from src.evolution.temporal import std_dev, temporal_weight, weighted_mean
-from src.models import BehavioralSignal, UserProfile
+from src.models import UserProfile
 
 
-class TestTemporalWeight:
-    def test_recent_weight(self):
-        now = datetime.now(timezone.utc)
-        assert temporal_weight(now, now) == 1.0
-
-    def test_30_day_weight(self):
-        now = datetime.now(timezone.utc)
-        old = now - timedelta(days=15)
-        assert temporal_weight(old, now) == 1.0
+# The in-memory signals below never reach the database, so they share one id
+# and skip the ORM constructor entirely.
+_SIGNAL_USER_ID = uuid.uuid4()
 
-    def test_60_day_weight(self):
-        now = datetime.now(timezone.utc)
-        old = now - timedelta(days=60)
-        assert temporal_weight(old, now) == 0.6
+_FakeSignal = namedtuple(
+    "_FakeSignal", "user_id signal_type signal_value confidence extracted_at"
+)
 
-    def test_120_day_weight(self):
-        now = datetime.now(timezone.utc)
-        old = now - timedelta(days=120)
-        assert temporal_weight(old, now) == 0.3
 
-    def test_200_day_weight(self):
+class TestTemporalWeight:
+    @pytest.mark.parametrize(
+        "days,expected",
+        [(0, 1.0), (15, 1.0), (60, 0.6), (120, 0.3), (200, 0.1)],
+    )
+    def test_temporal_weight(self, days, expected):
         now = datetime.now(timezone.utc)
-        old = now - timedelta(days=200)
-        assert temporal_weight(old, now) == 0.1
+        assert temporal_weight(now - timedelta(days=days), now) == expected
 
     def test_naive_datetime_handled(self):
         now = datetime.now(timezone.utc)
@@ -44,38 +38,37 @@ class TestTemporalWeight:
 
 
 class TestWeightedMean:
-    def test_equal_weights(self):
-        assert weighted_mean([5.0, 10.0], [1.0, 1.0]) == 7.5
-
-    def test_unequal_weights(self):
-        result = weighted_mean([5.0, 10.0], [2.0, 1.0])
-        assert abs(result - 6.667) < 0.01
-
-    def test_empty(self):
-        assert weighted_mean([], []) == 0.0
-
-    def test_zero_weights(self):
-        result = weighted_mean([5.0, 10.0], [0.0, 0.0])
-        assert result == 7.5  # fallback to simple mean
+    @pytest.mark.parametrize(
+        "values,weights,expected",
+        [
+            ([5.0, 10.0], [1.0, 1.0], 7.5),  # equal weights
+            ([5.0, 10.0], [2.0, 1.0], pytest.approx(20 / 3)),  # unequal weights
+            ([], [], 0.0),  # empty
+            ([5.0, 10.0], [0.0, 0.0], 7.5),  # zero weights fall back to simple mean
+        ],
+    )
+    def test_weighted_mean(self, values, weights, expected):
+        assert weighted_mean(values, weights) == expected
 
 
 class TestStdDev:
-    def test_no_variance(self):
-        assert std_dev([5.0, 5.0, 5.0]) == 0.0
-
-    def test_known_std(self):
-        result = std_dev([2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0])
-        assert abs(result - 2.0) < 0.1
-
-    def test_single_value(self):
-        assert std_dev([5.0]) == 0.0
+    @pytest.mark.parametrize(
+        "values,expected",
+        [
+            ([5.0, 5.0, 5.0], 0.0),  # no variance
+            ([2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0], pytest.approx(2.0)),
+            ([5.0], 0.0),  # single value
+        ],
+    )
+    def test_std_dev(self, values, expected):
+        assert std_dev(values) == expected
 
 
 class TestConflictResolver:
     def _make_signal(self, score: float, days_ago: float, confidence: float = 0.8):
         now = datetime.now(timezone.utc)
-        return BehavioralSignal(
-            user_id=uuid.uuid4(),
+        return _FakeSignal(
+            user_id=_SIGNAL_USER_ID,
             signal_type="temperament",
             signal_value={"score": score},
             confidence=confidence,
@@ -132,8 +125,8 @@ class TestSignalsInWindow:
         assert len(recent) == 2
 
     def _make_signal(self, extracted_at):
-        return BehavioralSignal(
-            user_id=uuid.uuid4(),
+        return _FakeSignal(
+            user_id=_SIGNAL_USER_ID,
             signal_type="test",
             signal_value={},
             confidence=0.8,
@@ -142,15 +135,15 @@ class TestSignalsInWindow:
 
 
 class TestArcDetector:
-    @pytest.mark.asyncio
-    async def test_detect_stable_arc(self, db, sample_user_id, sample_signals, sample_profile):
+    @pytest.mark.anyio
+    async def test_detect_stable_arc(self, db, sample_user_id, seeded_user):
         detector = ArcDetector()
         result = await detector.detect_arc(sample_user_id, db)
 
         assert "arc" in result
         assert result["confidence"] >= 0.0
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_insufficient_data(self, db):
         user_id = uuid.uuid4()
         profile = UserProfile(user_id=user_id)
@@ -165,7 +158,7 @@ class TestArcDetector:
 
 
 class TestSnapshotManager:
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_create_snapshot(self, db, sample_user_id, sample_profile):
         manager = SnapshotManager()
         snapshot = await manager.create_snapshot(sample_user_id, db)
@@ -174,19 +167,19 @@ class TestSnapshotManager:
         assert snapshot.user_id == sample_user_id
         assert "temperament" in snapshot.snapshot
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_should_snapshot_first_time(self, db, sample_user_id, sample_profile):
         manager = SnapshotManager()
         should = await manager.should_snapshot(sample_user_id, db)
         assert should is True
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_get_timeline_empty(self, db, sample_user_id, sample_profile):
         manager = SnapshotManager()
         timeline = await manager.get_timeline(sample_user_id, db)
         assert timeline == []
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_get_timeline_with_snapshots(self, db, sample_user_id, sample_profile):
         manager = SnapshotManager()
         await manager.create_snapshot(sample_user_id, db)
@@ -1,9 +1,9 @@
 import uuid
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
-from src.profile_engine.extractor import TraitExtractor, _format_conversation
+from src.profile_engine.extractor import _ROLE_PREFIXES, TraitExtractor, _format_conversation
 
 
 class TestFormatConversation:
@@ -16,6 +16,11 @@ class TestFormatConversation:
         assert "[USER]: Hello" in result
         assert "[ASSISTANT]: Hi there!" in result
 
+    def test_formats_unknown_roles_without_caching(self):
+        result = _format_conversation([{"role": "tool", "content": "42"}])
+        assert result == "[TOOL]: 42"
+        assert "tool" not in _ROLE_PREFIXES
+
     def test_truncates_long_messages(self):
         messages = [{"role": "user", "content": "x" * 3000}]
         result = _format_conversation(messages)
@@ -35,7 +40,7 @@ class TestFormatConversation:
 
 
 class TestTraitExtractor:
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_extract_signals(self, mock_anthropic, sample_messages):
         extractor = TraitExtractor(llm_client=mock_anthropic)
 
@@ -47,7 +52,7 @@ class TestTraitExtractor:
         assert signals["temperament"]["score"] == 7
         assert signals["temperament"]["label"] == "patient"
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_empty_messages(self, mock_anthropic):
         extractor = TraitExtractor(llm_client=mock_anthropic)
 
@@ -56,11 +61,11 @@ class TestTraitExtractor:
         assert signals["temperament"]["score"] == 5
         assert signals["temperament"]["label"] == "neutral"
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_validates_signal_bounds(self, mock_anthropic):
         # Return out-of-bounds values
-        mock_anthropic.generate = AsyncMock(
-            return_value='{"temperament":{"score":15,"label":"patient","evidence":""},"communication_style":{"formality":2.0,"verbosity":-1.0,"technicality":0.5,"structured":0.5},"sentiment":{"overall":5.0,"arc":"stable","frustration_detected":false},"life_stage":{"indicators":[],"confidence":0.5,"domain_expertise":[]},"topics":[],"cooperation":{"follows_instructions":0.5,"provides_context":0.5,"politeness":0.5}}'
+        mock_anthropic.generate_reply = (
+            '{"temperament":{"score":15,"label":"patient","evidence":""},"communication_style":{"formality":2.0,"verbosity":-1.0,"technicality":0.5,"structured":0.5},"sentiment":{"overall":5.0,"arc":"stable","frustration_detected":false},"life_stage":{"indicators":[],"confidence":0.5,"domain_expertise":[]},"topics":[],"cooperation":{"follows_instructions":0.5,"provides_context":0.5,"politeness":0.5}}'
         )
 
         extractor = TraitExtractor(llm_client=mock_anthropic)
@@ -74,10 +79,10 @@ class TestTraitExtractor:
         assert signals["communication_style"]["verbosity"] == 0.0  # clamped
         assert signals["sentiment"]["overall"] == 1.0  # clamped
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_handles_markdown_fences(self, mock_anthropic):
-        mock_anthropic.generate = AsyncMock(
-            return_value='```json\n{"temperament":{"score":5,"label":"neutral","evidence":""},"communication_style":{"formality":0.5,"verbosity":0.5,"technicality":0.5,"structured":0.5},"sentiment":{"overall":0.0,"arc":"stable","frustration_detected":false},"life_stage":{"indicators":[],"confidence":0.5,"domain_expertise":[]},"topics":[],"cooperation":{"follows_instructions":0.5,"provides_context":0.5,"politeness":0.5}}\n```'
+        mock_anthropic.generate_reply = (
+            '```json\n{"temperament":{"score":5,"label":"neutral","evidence":""},"communication_style":{"formality":0.5,"verbosity":0.5,"technicality":0.5,"structured":0.5},"sentiment":{"overall":0.0,"arc":"stable","frustration_detected":false},"life_stage":{"indicators":[],"confidence":0.5,"domain_expertise":[]},"topics":[],"cooperation":{"follows_instructions":0.5,"provides_context":0.5,"politeness":0.5}}\n```'
         )
 
         extractor = TraitExtractor(llm_client=mock_anthropic)
@@ -87,3 +92,14 @@ class TestTraitExtractor:
         )
 
         assert signals["temperament"]["score"] == 5
+
+    def test_validate_fills_missing_fields(self, mock_anthropic):
+        extractor = TraitExtractor(llm_client=mock_anthropic)
+
+        signals = extractor._validate_signals({"temperament": {"score": 0}, "sentiment": {"arc": "rising"}})
+
+        assert signals["temperament"] == {"score": 1, "label": "neutral", "evidence": ""}
+        assert signals["sentiment"] == {"overall": 0.0, "arc": "rising", "frustration_detected": False}
+        assert signals["communication_style"]["formality"] == 0.5
+        assert signals["life_stage"]["indicators"] == []
+        assert signals["topics"] == []
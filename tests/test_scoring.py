@@ -2,14 +2,22 @@ import math
 import uuid
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
 import pytest
+from sqlalchemy import delete
 
 from src.models import BehavioralSignal
-from src.scoring.calculator import ScoreCalculator
+from src.scoring import calculator
+from src.scoring.calculator import ScoreCalculator, _score_kernel
 from src.scoring.dimensions import DIMENSIONS
 from src.scoring.reasoning import generate_reasoning
 
 
+@pytest.fixture(autouse=True)
+def _clear_component_cache():
+    calculator._component_cache.clear()
+
+
 class TestScoreCalculator:
     def test_recency_weight(self):
         calc = ScoreCalculator(decay_lambda=0.03)
@@ -24,7 +32,28 @@ class TestScoreCalculator:
         # 100 days: much lower
         assert calc.recency_weight(100) < 0.1
 
-    @pytest.mark.asyncio
+    def test_recency_weights_vectorized(self):
+        calc = ScoreCalculator(decay_lambda=0.03)
+
+        days = np.array([-1.0, 0.0, 23.1, 100.0])
+        weights = calc.recency_weights(days)
+
+        np.testing.assert_allclose(weights[:3], [1.0, 1.0, 0.5], atol=0.05)
+        assert weights[3] < 0.1
+        np.testing.assert_allclose(weights, [calc.recency_weight(d) for d in days])
+
+    def test_score_kernel(self):
+        weighted_sum, total_weight = _score_kernel(
+            np.array([0, 1, 0]),
+            np.array([80.0, 20.0, 40.0]),
+            np.array([1.0, 1.0, 0.5]),
+            np.array([0.6, 0.4]),
+        )
+        # 0.6 * (80*1 + 40*0.5) + 0.4 * (20*1), over 0.6 * 1.5 + 0.4 * 1
+        assert abs(weighted_sum - 68.0) < 1e-9
+        assert abs(total_weight - 1.3) < 1e-9
+
+    @pytest.mark.anyio
     async def test_compute_score_with_signals(self, db, sample_user_id, sample_signals, sample_profile):
         calc = ScoreCalculator()
 
@@ -34,7 +63,7 @@ class TestScoreCalculator:
         assert score.dimension == "cooperation_level"
         assert score.reasoning is not None
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_compute_all_scores(self, db, sample_user_id, sample_signals, sample_profile):
         calc = ScoreCalculator()
 
@@ -44,7 +73,107 @@ class TestScoreCalculator:
             assert dim_name in DIMENSIONS
             assert 0 <= score.score <= 100
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_all_scores_match_single_dimension(self, db, sample_user_id, sample_signals, sample_profile):
+        calc = ScoreCalculator()
+
+        scores = await calc.compute_all_scores(sample_user_id, db)
+        for dim_name, score in scores.items():
+            single = await calc.compute_score(sample_user_id, dim_name, db, previous_scores={})
+            assert score.score == single.score
+
+    @pytest.mark.anyio
+    async def test_compute_all_scores_uses_previous(self, db, sample_user_id, sample_signals, sample_profile):
+        calc = ScoreCalculator()
+
+        first = await calc.compute_all_scores(sample_user_id, db)
+        await db.flush()
+        second = await calc.compute_all_scores(sample_user_id, db)
+
+        for dim_name, score in second.items():
+            assert score.previous_score == first[dim_name].score
+
+    @pytest.mark.anyio
+    async def test_rescoring_reuses_components(self, db, sample_user_id, sample_signals, sample_profile):
+        calc = ScoreCalculator()
+
+        first = await calc.compute_all_scores(sample_user_id, db)
+        second = await calc.compute_all_scores(sample_user_id, db)
+
+        assert calc.statistics == {"initial": 1, "cached": 1}
+        for dim_name, score in second.items():
+            assert score.score == first[dim_name].score
+
+    @pytest.mark.anyio
+    async def test_component_cache_shared_across_calculators(self, db, sample_user_id, sample_signals, sample_profile):
+        await ScoreCalculator().compute_all_scores(sample_user_id, db)
+
+        calc = ScoreCalculator()
+        await calc.compute_all_scores(sample_user_id, db)
+        assert calc.statistics == {"initial": 0, "cached": 1}
+
+    @pytest.mark.anyio
+    async def test_component_cache_misses_reused_signal_ids(self, db):
+        # SQLite hands out the same rowid again once the table is emptied, so
+        # the second seeding reuses the first one's signal id.
+        user_id = uuid.uuid4()
+        now = datetime.now(timezone.utc)
+        scores = []
+        for days_ago, level in ((2, 0.1), (1, 0.9)):
+            await db.execute(delete(BehavioralSignal))
+            db.add(
+                BehavioralSignal(
+                    user_id=user_id,
+                    signal_type="cooperation",
+                    signal_value={"follows_instructions": level, "provides_context": level, "politeness": level},
+                    confidence=0.8,
+                    extracted_at=now - timedelta(days=days_ago),
+                )
+            )
+            await db.flush()
+            score = await ScoreCalculator().compute_score(user_id, "cooperation_level", db)
+            scores.append(score.score)
+
+        assert scores == [10.0, 90.0]
+
+    @pytest.mark.anyio
+    async def test_topic_diversity_counts_distinct_topics(self, db):
+        user_id = uuid.uuid4()
+        db.add(
+            BehavioralSignal(
+                user_id=user_id,
+                signal_type="topics",
+                signal_value={"topics": ["finance", "finance", "travel", "finance"]},
+                confidence=0.8,
+            )
+        )
+        await db.flush()
+
+        score = await ScoreCalculator().compute_score(user_id, "engagement_quality", db)
+        assert score.score == 40.0
+
+    @pytest.mark.anyio
+    async def test_reasoning_level_on_bucket_boundary(self, db):
+        # A single topic scores exactly 20, the moderate-low boundary; the
+        # weighted mean of one component must not land just below it.
+        user_id = uuid.uuid4()
+        now = datetime.now(timezone.utc)
+        db.add(
+            BehavioralSignal(
+                user_id=user_id,
+                signal_type="topics",
+                signal_value={"topics": ["finance"]},
+                confidence=0.8,
+                extracted_at=now,
+            )
+        )
+        await db.flush()
+
+        score = await ScoreCalculator().compute_score(user_id, "engagement_quality", db, now=now)
+        assert score.score == 20.0
+        assert score.reasoning.startswith("Engagement quality is moderate-low at 20/100.")
+
+    @pytest.mark.anyio
     async def test_default_score_no_signals(self, db):
         user_id = uuid.uuid4()
         from src.models import UserProfile
@@ -58,7 +187,18 @@ class TestScoreCalculator:
         assert score.score == 50.0  # default
         assert "Default" in score.reasoning or "no behavioral" in score.reasoning.lower()
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_all_default_scores_no_signals(self, db):
+        calc = ScoreCalculator()
+        scores = await calc.compute_all_scores(uuid.uuid4(), db)
+
+        assert set(scores) == set(DIMENSIONS)
+        for score in scores.values():
+            assert score.score == 50.0
+            assert score.component_signals == {"components": []}
+        assert calc.statistics == {"initial": 0, "cached": 0}
+
+    @pytest.mark.anyio
     async def test_expertise_score(self, db, sample_user_id, sample_signals, sample_profile):
         calc = ScoreCalculator()
 
@@ -66,7 +206,7 @@ class TestScoreCalculator:
         # User has high technicality (0.9) so expertise should be above average
         assert score.score > 50
 
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_escalation_risk_for_calm_user(self, db, sample_user_id, sample_signals, sample_profile):
         calc = ScoreCalculator()
 
@@ -74,13 +214,11 @@ class TestScoreCalculator:
         # User has temperament 7/10 and positive sentiment, risk should be moderate-low
         assert score.score < 60
 
-    def test_unknown_dimension(self, db, sample_user_id):
+    @pytest.mark.anyio
+    async def test_unknown_dimension(self, db, sample_user_id):
         calc = ScoreCalculator()
         with pytest.raises(ValueError, match="Unknown dimension"):
-            import asyncio
-            asyncio.get_event_loop().run_until_complete(
-                calc.compute_score(sample_user_id, "nonexistent", db)
-            )
+            await calc.compute_score(sample_user_id, "nonexistent", db)
 
 
 class TestDimensions:
@@ -119,6 +257,16 @@ class TestReasoning:
         result = generate_reasoning("cooperation_level", 75.0, 75.0, [])
         assert "No significant change" in result
 
+    def test_generate_reasoning_no_change_skips_signals(self):
+        result = generate_reasoning(
+            "cooperation_level",
+            75.4,
+            75.0,
+            [{"signal_id": 1, "key": "cooperation.politeness", "value": 90.0, "weight": 0.4, "days_ago": 1.0}],
+        )
+        assert "No significant change" in result
+        assert "Key signals" not in result
+
     def test_generate_reasoning_no_previous(self):
         result = generate_reasoning("expertise_level", 80.0, None, [])
         assert "high" in result